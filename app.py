@@ -1,14 +1,29 @@
 from flask import Flask, render_template, request, redirect, url_for, jsonify
+import csv
+import io
 import json
+import heapq
+from collections import deque
+from functools import lru_cache
+from itertools import compress
 from dataclasses import dataclass, field
 from typing import List, Tuple, Dict, Optional
 
+# orjson is faster for large gantt payloads; fall back to stdlib json if it isn't installed
+try:
+    import orjson
+
+    def to_json(obj) -> str:
+        return orjson.dumps(obj).decode('utf-8')
+except ImportError:
+    to_json = json.dumps
+
 app = Flask(__name__)
 
 # -------------------------
 # Process dataclass
 # -------------------------
-@dataclass
+@dataclass(slots=True)
 class Proc:
     pid: str
     arrival: int
@@ -21,7 +36,7 @@ class Proc:
 
 # -------------------------
 # Algorithm implementations
-# All algorithms accept List[Proc] (fresh copies recommended)
+# All algorithms accept List[Proc] and do not mutate it
 # They return a gantt list: List[Tuple[pid, start, end]]
 # -------------------------
 def fcfs(procs: List[Proc]):
@@ -39,134 +54,138 @@ def fcfs(procs: List[Proc]):
     return gantt
 
 def sjf_nonpreemptive(procs: List[Proc]):
-    procs = [Proc(p.pid, p.arrival, p.burst, p.priority) for p in procs]
+    procs = sorted(procs, key=lambda p: p.arrival)
+    n = len(procs)
     time = 0
     gantt = []
-    ready = []
-    remaining = procs[:]
-    while remaining or ready:
-        for p in remaining[:]:
-            if p.arrival <= time:
-                ready.append(p); remaining.remove(p)
+    ready = []  # min-heap of (burst, arrival, seq, proc)
+    nxt = 0     # index of the next process to arrive
+    while nxt < n or ready:
+        while nxt < n and procs[nxt].arrival <= time:
+            p = procs[nxt]
+            heapq.heappush(ready, (p.burst, p.arrival, nxt, p)); nxt += 1
         if not ready:
-            next_t = min(remaining, key=lambda x: x.arrival).arrival
+            next_t = procs[nxt].arrival
             gantt.append(("idle", time, next_t)); time = next_t; continue
-        ready.sort(key=lambda x: (x.burst, x.arrival))
-        p = ready.pop(0)
+        p = heapq.heappop(ready)[3]
         start = time; end = time + p.burst
         gantt.append((p.pid, start, end))
         time = end
     return gantt
 
 def sjf_preemptive(procs: List[Proc]):
-    procs = [Proc(p.pid, p.arrival, p.burst, p.priority) for p in procs]
+    procs = sorted(procs, key=lambda p: p.arrival)
+    n = len(procs)
     time = 0
     gantt = []
-    ready = []
-    remaining = procs[:]
-    current = None
+    ready = []  # min-heap of (remaining, arrival, seq, proc)
+    nxt = 0     # index of the next process to arrive
+    current = None; current_seq = None; current_rem = 0
     interval_start = None
-    while remaining or ready or current:
-        for p in remaining[:]:
-            if p.arrival <= time:
-                ready.append(p); remaining.remove(p)
-        candidates = ready + ([current] if current else [])
-        candidates = [c for c in candidates if c is not None]
-        if not candidates:
-            if remaining:
-                nxt = min(remaining, key=lambda x: x.arrival).arrival
-                gantt.append(("idle", time, nxt)); time = nxt; continue
-            break
-        candidates.sort(key=lambda x: (x.remaining, x.arrival))
-        chosen = candidates[0]
-        if current is not None and chosen.pid != current.pid:
-            gantt.append((current.pid, interval_start, time)); interval_start = None
-        if chosen in ready: ready.remove(chosen)
-        if chosen is not current:
-            current = chosen
+    while nxt < n or ready or current:
+        # a newcomer arrives later than current, so it only wins on a strictly shorter burst;
+        # everything already waiting lost to current before and current only got shorter since
+        preempt = False
+        while nxt < n and procs[nxt].arrival <= time:
+            p = procs[nxt]
+            heapq.heappush(ready, (p.burst, p.arrival, nxt, p)); nxt += 1
+            if current is not None and p.burst < current_rem:
+                preempt = True
+        if current is None:
+            if not ready:
+                gantt.append(("idle", time, procs[nxt].arrival)); time = procs[nxt].arrival; continue
+            current_rem, _, current_seq, current = heapq.heappop(ready)
+            interval_start = time
+        elif preempt:
+            gantt.append((current.pid, interval_start, time))
+            entry = (current_rem, current.arrival, current_seq, current)
+            current_rem, _, current_seq, current = heapq.heapreplace(ready, entry)
             interval_start = time
-        # run 1 unit
-        current.remaining -= 1
-        time += 1
-        if current.remaining == 0:
+        # run until the next arrival or until current finishes
+        run = current_rem
+        if nxt < n and procs[nxt].arrival - time < run:
+            run = procs[nxt].arrival - time
+        current_rem -= run
+        time += run
+        if current_rem == 0:
             gantt.append((current.pid, interval_start, time))
             current = None
             interval_start = None
     return gantt
 
 def round_robin(procs: List[Proc], quantum: int = 2):
-    procs = [Proc(p.pid, p.arrival, p.burst, p.priority) for p in procs]
+    procs = sorted(procs, key=lambda p: p.arrival)
+    n = len(procs)
     time = 0
     gantt = []
-    queue = []
-    remaining = procs[:]
-    while remaining or queue:
-        for p in remaining[:]:
-            if p.arrival <= time:
-                queue.append(p); remaining.remove(p)
+    queue = deque()  # (proc, remaining) pairs
+    nxt = 0     # index of the next process to arrive
+    while nxt < n or queue:
+        while nxt < n and procs[nxt].arrival <= time:
+            queue.append((procs[nxt], procs[nxt].burst)); nxt += 1
         if not queue:
-            if remaining:
-                nxt = min(remaining, key=lambda x: x.arrival).arrival
-                gantt.append(("idle", time, nxt)); time = nxt; continue
-            break
-        p = queue.pop(0)
-        if p.remaining <= 0:
+            next_t = procs[nxt].arrival
+            gantt.append(("idle", time, next_t)); time = next_t; continue
+        p, rem = queue.popleft()
+        if rem <= 0:
             continue
-        run = min(quantum, p.remaining)
+        run = quantum if quantum < rem else rem
         start = time; end = time + run
+        if gantt and gantt[-1][0] == p.pid and gantt[-1][2] == start:
+            # same process got the next slice too: extend its interval
+            start = gantt.pop()[1]
         gantt.append((p.pid, start, end))
-        p.remaining -= run
+        rem -= run
         time = end
-        for q in remaining[:]:
-            if q.arrival <= time:
-                queue.append(q); remaining.remove(q)
-        if p.remaining > 0:
-            queue.append(p)
+        while nxt < n and procs[nxt].arrival <= time:
+            queue.append((procs[nxt], procs[nxt].burst)); nxt += 1
+        if rem > 0:
+            queue.append((p, rem))
     return gantt
 
 def priority_nonpreemptive(procs: List[Proc]):
-    procs = [Proc(p.pid, p.arrival, p.burst, p.priority) for p in procs]
-    time = 0; gantt = []; ready = []; remaining = procs[:]
-    while remaining or ready:
-        for p in remaining[:]:
-            if p.arrival <= time:
-                ready.append(p); remaining.remove(p)
+    procs = sorted(procs, key=lambda p: p.arrival)
+    n = len(procs)
+    time = 0; gantt = []; ready = []; nxt = 0
+    while nxt < n or ready:
+        while nxt < n and procs[nxt].arrival <= time:
+            p = procs[nxt]
+            heapq.heappush(ready, (p.priority, p.arrival, nxt, p)); nxt += 1
         if not ready:
-            if remaining:
-                nxt = min(remaining, key=lambda x: x.arrival).arrival
-                gantt.append(("idle", time, nxt)); time = nxt; continue
-            break
-        ready.sort(key=lambda x: (x.priority, x.arrival))
-        p = ready.pop(0)
+            next_t = procs[nxt].arrival
+            gantt.append(("idle", time, next_t)); time = next_t; continue
+        p = heapq.heappop(ready)[3]
         start = time; end = time + p.burst
         gantt.append((p.pid, start, end))
         time = end
     return gantt
 
 def priority_preemptive(procs: List[Proc]):
-    procs = [Proc(p.pid, p.arrival, p.burst, p.priority) for p in procs]
-    time = 0; gantt = []; ready = []; remaining = procs[:]
-    current = None; interval_start = None
-    while remaining or ready or current:
-        for p in remaining[:]:
-            if p.arrival <= time:
-                ready.append(p); remaining.remove(p)
-        candidates = ready + ([current] if current else [])
-        candidates = [c for c in candidates if c is not None]
-        if not candidates:
-            if remaining:
-                nxt = min(remaining, key=lambda x: x.arrival).arrival
-                gantt.append(("idle", time, nxt)); time = nxt; continue
-            break
-        candidates.sort(key=lambda x: (x.priority, x.arrival, x.remaining))
-        chosen = candidates[0]
-        if current is not None and chosen.pid != current.pid:
-            gantt.append((current.pid, interval_start, time)); interval_start = None
-        if chosen in ready: ready.remove(chosen)
-        if chosen is not current:
-            current = chosen; interval_start = time
-        current.remaining -= 1; time += 1
-        if current.remaining == 0:
+    procs = sorted(procs, key=lambda p: p.arrival)
+    n = len(procs)
+    time = 0; gantt = []; ready = []; nxt = 0
+    current = None; current_seq = None; current_rem = 0; interval_start = None
+    while nxt < n or ready or current:
+        # only a newcomer with a strictly better priority can displace current (see sjf_preemptive)
+        preempt = False
+        while nxt < n and procs[nxt].arrival <= time:
+            p = procs[nxt]
+            heapq.heappush(ready, (p.priority, p.arrival, p.burst, nxt, p)); nxt += 1
+            if current is not None and p.priority < current.priority:
+                preempt = True
+        if current is None:
+            if not ready:
+                gantt.append(("idle", time, procs[nxt].arrival)); time = procs[nxt].arrival; continue
+            _, _, current_rem, current_seq, current = heapq.heappop(ready); interval_start = time
+        elif preempt:
+            gantt.append((current.pid, interval_start, time))
+            entry = (current.priority, current.arrival, current_rem, current_seq, current)
+            _, _, current_rem, current_seq, current = heapq.heapreplace(ready, entry); interval_start = time
+        run = current_rem
+        if nxt < n and procs[nxt].arrival - time < run:
+            run = procs[nxt].arrival - time
+        current_rem -= run; time += run
+        if current_rem == 0:
             gantt.append((current.pid, interval_start, time)); current = None; interval_start = None
     return gantt
 
@@ -175,65 +194,46 @@ def priority_preemptive(procs: List[Proc]):
 # Builds metrics from gantt and process descriptor list
 # -------------------------
 def compute_metrics_from_gantt(proc_desc: List[Dict], gantt: List[Tuple[str, int, int]]):
-    info = {p['pid']: {'arrival': int(p['arrival']), 'burst': int(p['burst']), 'priority': int(p.get('priority',0))} for p in proc_desc}
-    starts = {pid: None for pid in info}
-    completions = {pid: None for pid in info}
+    n = len(proc_desc)
+    pids = [p['pid'] for p in proc_desc]
+    arrivals = [int(p['arrival']) for p in proc_desc]
+    bursts = [int(p['burst']) for p in proc_desc]
+    priorities = [int(p.get('priority', 0)) for p in proc_desc]
+    pid_to_idx = {pid: i for i, pid in enumerate(pids)}
+    starts = [None] * n
+    completions = [None] * n
     for pid, s, e in gantt:
         if pid == 'idle': continue
-        if starts[pid] is None:
-            starts[pid] = s
-        completions[pid] = e
-    rows = []
-    for pid, d in info.items():
-        if starts[pid] is None or completions[pid] is None:
-            # if a process never ran, mark NA and continue
-            rows.append({'pid': pid, 'arrival': d['arrival'], 'burst': d['burst'],
-                         'start': None, 'completion': None, 'TAT': None, 'WT': None, 'RT': None, 'priority': d['priority']})
-            continue
-        tat = completions[pid] - d['arrival']
-        wt = tat - d['burst']
-        rt = starts[pid] - d['arrival']
-        rows.append({'pid': pid, 'arrival': d['arrival'], 'burst': d['burst'],
-                     'start': starts[pid], 'completion': completions[pid], 'TAT': tat, 'WT': wt, 'RT': rt, 'priority': d['priority']})
+        i = pid_to_idx[pid]
+        if starts[i] is None:
+            starts[i] = s
+        completions[i] = e
+    # if a process never ran, its metrics stay None
+    tats = [None if c is None else c - a for c, a in zip(completions, arrivals)]
+    wts = [None if t is None else t - b for t, b in zip(tats, bursts)]
+    rts = [None if s is None else s - a for s, a in zip(starts, arrivals)]
+    rows = [{'pid': pids[i], 'arrival': arrivals[i], 'burst': bursts[i],
+             'start': starts[i], 'completion': completions[i],
+             'TAT': tats[i], 'WT': wts[i], 'RT': rts[i], 'priority': priorities[i]}
+            for i in range(n)]
     # averages (only for completed)
-    completed = [r for r in rows if r['TAT'] is not None]
-    avg_tat = sum(r['TAT'] for r in completed)/len(completed) if completed else None
-    avg_wt  = sum(r['WT'] for r in completed)/len(completed) if completed else None
-    avg_rt  = sum(r['RT'] for r in completed)/len(completed) if completed else None
+    done = [c is not None for c in completions]
+    count = sum(done)
+    avg_tat = sum(compress(tats, done))/count if count else None
+    avg_wt  = sum(compress(wts, done))/count if count else None
+    avg_rt  = sum(compress(rts, done))/count if count else None
     return rows, {'avg_tat': avg_tat, 'avg_wt': avg_wt, 'avg_rt': avg_rt}
 
 # -------------------------
-# Flask routes
+# Cached simulation
+# Memoizes gantt + metrics on (algorithm, quantum, process tuples).
+# The key keeps input order since it decides ties and the row order.
 # -------------------------
-@app.route("/", methods=["GET"])
-def index():
-    # default example processes shown in textarea
-    example = "P1,0,8,2\nP2,1,4,1\nP3,2,9,3\nP4,3,5,2"
-    return render_template("index.html", example=example)
-
-@app.route("/simulate", methods=["POST"])
-def simulate():
-    # parse form
-    processes_text = request.form.get("processes", "")
-    algorithm = request.form.get("algorithm", "fcfs")
-    quantum = int(request.form.get("quantum", "2"))
-
-    # parse CSV-like input: PID,arrival,burst,priority (priority optional)
-    proc_desc = []
-    for line in processes_text.strip().splitlines():
-        if not line.strip():
-            continue
-        parts = [x.strip() for x in line.split(",")]
-        if len(parts) < 3:
-            continue
-        pid = parts[0]
-        arrival = int(parts[1])
-        burst = int(parts[2])
-        priority = int(parts[3]) if len(parts) >= 4 else 0
-        proc_desc.append({'pid': pid, 'arrival': arrival, 'burst': burst, 'priority': priority})
-
-    # create Proc objects
-    proc_objs = [Proc(d['pid'], d['arrival'], d['burst'], d['priority']) for d in proc_desc]
+@lru_cache(maxsize=256)
+def run_simulation(algorithm: str, quantum: int, procs_key: Tuple[Tuple[str, int, int, int], ...]):
+    proc_desc = [{'pid': pid, 'arrival': arrival, 'burst': burst, 'priority': priority}
+                 for pid, arrival, burst, priority in procs_key]
+    proc_objs = [Proc(pid, arrival, burst, priority) for pid, arrival, burst, priority in procs_key]
 
     # select algorithm
     if algorithm == "fcfs":
@@ -253,18 +253,43 @@ def simulate():
 
     # compute metrics
     rows, avgs = compute_metrics_from_gantt(proc_desc, gantt)
+    return tuple(gantt), rows, avgs
+
+# -------------------------
+# Flask routes
+# -------------------------
+@app.route("/", methods=["GET"])
+def index():
+    # default example processes shown in textarea
+    example = "P1,0,8,2\nP2,1,4,1\nP3,2,9,3\nP4,3,5,2"
+    return render_template("index.html", example=example)
+
+@app.route("/simulate", methods=["POST"])
+def simulate():
+    # parse form
+    processes_text = request.form.get("processes", "").strip()
+    algorithm = request.form.get("algorithm", "fcfs")
+    quantum = int(request.form.get("quantum", "2"))
 
-    # convert gantt to JSON-friendly
-    gantt_json = [{'pid': pid, 'start': s, 'end': e} for (pid, s, e) in gantt]
+    # parse CSV-like input: PID,arrival,burst,priority (priority optional)
+    # blank and short rows (fewer than 3 fields) are skipped
+    procs_key = tuple((row[0].strip(), int(row[1]), int(row[2]), int(row[3]) if len(row) >= 4 else 0)
+                      for row in csv.reader(io.StringIO(processes_text)) if len(row) >= 3)
+
+    # identical inputs reuse the cached gantt and metrics; quantum only matters for RR
+    gantt, rows, avgs = run_simulation(algorithm, quantum if algorithm == "rr" else 0, procs_key)
 
     return render_template("index.html",
-                           example="\n".join(f"{r['pid']},{r['arrival']},{r['burst']},{r.get('priority',0)}" for r in proc_desc),
-                           gantt_json=json.dumps(gantt_json),
+                           example=processes_text,
+                           gantt_json=to_json(gantt),  # [[pid, start, end], ...]
                            rows=rows,
                            avgs=avgs,
                            chosen_algorithm=algorithm,
                            quantum=quantum)
 
+# compile the template at import so the first request (per gunicorn worker) doesn't pay for it
+app.jinja_env.get_template("index.html")
+
 if __name__ == "__main__":
     app.run()
 